@@ -0,0 +1,237 @@
+import io
+
+import streamlit as st
+import numpy as np
+
+import physiology
+
+# --- PALETTE ---
+# Tubule segments
+_PCT_COLOR = '#FF9F40'
+_LOOP_COLOR = '#A0A0A0'
+_DCT_COLOR = '#4BC0C0'
+_CD_COLOR = '#FFD700'
+_CD_LABEL_COLOR = '#B8860B'
+
+# Cell compartments (fill, label)
+_LUMEN_COLORS = ('#E0F7FA', '#006064')
+_BLOOD_COLORS = ('#FFEBEE', '#B71C1C')
+_CELL_COLOR = '#FFF9C4'
+
+# MR status (Inactive / Active / Basal) and Na+ influx (arrow, label)
+_MR_INACTIVE_COLOR = '#CFD8DC'
+_MR_ACTIVE_COLOR = '#00E676'
+_MR_BASAL_COLOR = '#A5D6A7'
+_NA_INFLUX_COLORS = ('#4CAF50', '#2E7D32')
+
+# Reference ranges for the data panel: (low, high, colour below, colour above).
+# Values inside [low, high] are shown in green.
+_BP_RANGE = (105, 135, 'blue', 'red')
+_K_RANGE = (3.5, 5.2, 'red', 'red')
+_ALDO_RANGE = (3, 20, 'blue', 'red')
+
+def _range_color(value, ref_range):
+    low, high, below, above = ref_range
+    if value < low: return below
+    if value > high: return above
+    return 'green'
+
+# Matplotlib is imported inside the draw helpers: they only run while the
+# SVG cache is being filled, so reruns served from it never touch Matplotlib.
+def _build_layout():
+    from matplotlib.figure import Figure
+
+    # Plain Figure rather than plt.figure: skips the pyplot backend manager
+    # and keeps the throwaway figures out of pyplot's global registry.
+    fig = Figure(figsize=(12, 10), layout='none') # no tight/constrained layout pass
+    grid = fig.add_gridspec(3, 2)
+    
+    ax_nephron = fig.add_subplot(grid[0, :])
+    ax_cell = fig.add_subplot(grid[1:, 0])
+    ax_data = fig.add_subplot(grid[1:, 1])
+    axes = (ax_nephron, ax_cell, ax_data)
+
+    # All limits are fixed (ax_data keeps the default 0-1), so no artist add
+    # should trigger an autoscale pass.
+    for ax in axes:
+        ax.set_autoscale_on(False)
+    return fig, axes
+
+def _draw_static(ax_nephron, ax_cell, ax_data):
+    import matplotlib.patches as patches
+    from matplotlib.collections import LineCollection, PatchCollection
+
+    # Everything here is identical across scenarios; draw_dashboard only
+    # layers the scenario-dependent overlays on top.
+
+    # === MACRO NEPHRON ===
+    ax_nephron.set_title("Nephron Overview", fontweight='bold')
+    ax_nephron.set_xlim(0, 12)
+    ax_nephron.set_ylim(0, 5)
+    ax_nephron.axis('off')
+    
+    lw = 12
+    # Draw Segments (one collection for the whole tubule)
+    ax_nephron.add_collection(LineCollection(
+        [[(1, 4), (3, 4)],                          # PCT
+         [(3, 4), (4, 1), (4, 1), (5, 4)],          # Loop
+         [(5, 4), (7, 4)],                          # DCT
+         [(7, 4), (8, 4), (8, 1), (9, 1)]],         # CD
+        colors=[_PCT_COLOR, _LOOP_COLOR, _DCT_COLOR, _CD_COLOR],
+        linewidths=[lw, lw, lw, lw*1.5],
+        capstyle='round', joinstyle='round', zorder=2,
+    ), autolim=False)
+
+    # Labels (segment names, then transporters)
+    segment_style = dict(ha='center', fontsize=8, weight='bold')
+    ax_nephron.text(2, 4.4, "PCT", **segment_style)
+    ax_nephron.text(4, 0.5, "Loop", ha='center', fontsize=8)
+    ax_nephron.text(6, 4.4, "DCT", **segment_style)
+    ax_nephron.text(8, 4.4, "CD", color=_CD_LABEL_COLOR, **segment_style)
+
+    transporter_style = dict(ha='center', va='center', fontsize=6)
+    ax_nephron.text(2, 4, "NHE3", color='white', **transporter_style)
+    ax_nephron.text(4, 1.5, "NKCC2", **transporter_style)
+
+    # === MICRO CELL ===
+    ax_cell.set_title("Principal Cell (Zoom)", fontweight='bold')
+    ax_cell.set_xlim(0, 10)
+    ax_cell.set_ylim(0, 10)
+    ax_cell.axis('off')
+    
+    # Compartments, cell body and nucleus outline (MR status is drawn inside
+    # it) as one collection, keeping each patch's own style
+    ax_cell.add_collection(PatchCollection([
+        patches.Rectangle((0, 0), 3, 10, fc=_LUMEN_COLORS[0], alpha=0.5), # Lumen
+        patches.Rectangle((7, 0), 3, 10, fc=_BLOOD_COLORS[0], alpha=0.5), # Blood
+        patches.FancyBboxPatch((3, 1), 4, 8, boxstyle=patches.BoxStyle.Round(pad=0.1), fc=_CELL_COLOR, ec='black', lw=2),
+        patches.Circle((5, 4), 0.7, fc='white', ec='black', ls='--'),
+    ], match_original=True), autolim=False)
+    ax_cell.text(1.5, 9.5, "LUMEN", ha='center', color=_LUMEN_COLORS[1], weight='bold')
+    ax_cell.text(8.5, 9.5, "BLOOD", ha='center', color=_BLOOD_COLORS[1], weight='bold')
+
+    # ENaC (black) and ROMK (purple) channel walls
+    ax_cell.add_collection(LineCollection(
+        [[(3, 6), (4, 6)], [(3, 5), (4, 5)],
+         [(3, 3), (3.5, 3)], [(3, 2), (3.5, 2)]],
+        colors=['black', 'black', 'purple', 'purple'],
+        linewidths=2, capstyle='projecting', zorder=2,
+    ), autolim=False)
+    ax_cell.text(3.5, 4.5, "ENaC", ha='center', fontsize=9, weight='bold')
+
+    # === DATA PANEL ===
+    ax_data.axis('off')
+    for y, heading in ((0.9, "1. Plasma Aldosterone"), (0.6, "2. Blood Pressure"), (0.3, "3. Serum Potassium")):
+        ax_data.text(0, y, heading, fontsize=10, color='gray')
+
+def draw_dashboard(flux, deliv, aldo, mr_eff, systolic, k_val, pore_blocked):
+    import matplotlib.patches as patches
+
+    fig, (ax_nephron, ax_cell, ax_data) = _build_layout()
+    _draw_static(ax_nephron, ax_cell, ax_data)
+    
+    # === MACRO NEPHRON ===
+    # Na+ Dots (same count on the flat and the descending CD limb)
+    dot_count = int(12 * deliv)
+    dot_count = min(60, dot_count) 
+    n_dots = dot_count // 2 + 1
+    xs = np.concatenate([np.linspace(7, 8, n_dots), np.full(n_dots, 8.0)])
+    ys = np.concatenate([np.full(n_dots, 4.0), np.linspace(4, 1, n_dots)])
+    # One marker-only Line2D; size and edge match the old scatter(s=15) dots
+    ax_nephron.plot(xs, ys, 'o', color='blue', markersize=15 ** 0.5, markeredgewidth=1.5, zorder=10)
+    
+    if deliv > 2.0:
+        ax_nephron.text(8.5, 3.5, "High Luminal\nNa+", color='blue', fontsize=8, ha='left')
+
+    # === MICRO CELL ===
+    # -- MR STATUS --
+    if mr_eff < 0.1: # Aldactone
+        mr_col = 'gray'
+        mr_txt = "MR Blocked"
+        ax_cell.text(5, 4, "❌", ha='center', va='center', fontsize=20)
+    elif aldo < 2.0: # Liddle
+        mr_col = _MR_INACTIVE_COLOR
+        mr_txt = "MR Inactive"
+    elif aldo > 20: # High Aldo
+        mr_col = _MR_ACTIVE_COLOR
+        mr_txt = "MR Active"
+        ax_cell.arrow(5, 4.5, -1, 1, head_width=0.3, color=_MR_ACTIVE_COLOR, lw=3)
+    else: 
+        mr_col = _MR_BASAL_COLOR
+        mr_txt = "MR Basal"
+        ax_cell.arrow(5, 4.5, -1, 1, head_width=0.2, color=_MR_BASAL_COLOR, lw=1)
+
+    ax_cell.add_patch(patches.Circle((5, 4), 0.3, fc=mr_col))
+    # FIX: MOVED UP TO 3.2 (Under Nucleus)
+    ax_cell.text(5, 3.2, mr_txt, ha='center', fontsize=9, weight='bold')
+
+    # -- ENaC CHANNEL --
+    if pore_blocked: # Amiloride
+        ax_cell.add_patch(patches.Circle((3, 5.5), 0.3, fc='red'))
+        ax_cell.text(2.2, 5.5, "Plugged", color='red', fontsize=9, ha='right')
+        
+    elif flux < 0.1:
+        ax_cell.text(3.5, 5.5, "No Flux", fontsize=8, ha='center', va='center', color='red')
+        
+    else:
+        w = min(1.2, flux * 0.4)
+        ax_cell.arrow(1.5, 5.5, 3.5, 0, head_width=0.3, color=_NA_INFLUX_COLORS[0], lw=w*10)
+        ax_cell.text(2, 6.2, "Na+ Influx", color=_NA_INFLUX_COLORS[1], weight='bold')
+
+    # -- ROMK CHANNEL --
+    if flux > 0.8:
+        ax_cell.arrow(4.5, 2.5, -3.0, 0, head_width=0.2, color='purple', lw=3)
+        # FIX: MOVED DOWN TO 1.5 (Under Channel)
+        ax_cell.text(4, 1.5, "K+ Secretion", color='purple', fontsize=8)
+    elif flux > 0.2: 
+        ax_cell.arrow(4.5, 2.5, -2.0, 0, head_width=0.1, color='purple', lw=1)
+        # FIX: MOVED DOWN TO 1.5
+        ax_cell.text(4, 1.5, "Normal K+", color='purple', fontsize=8)
+    else:
+        # FIX: MOVED DOWN TO 1.5
+        ax_cell.text(2.5, 1.5, "Reduced", color='gray', fontsize=8, ha='center')
+
+    # === DATA PANEL ===
+    c_bp = _range_color(systolic, _BP_RANGE)
+    c_k = _range_color(k_val, _K_RANGE)
+    c_aldo = _range_color(aldo, _ALDO_RANGE)
+    
+    diastolic = systolic * 0.66 # Diastolic is modelled as ~2/3 of systolic
+
+    bp_flag = k_flag = None
+    if systolic < 100: bp_flag = ("Hypotension", 'blue')
+    if systolic > 140: bp_flag = ("Hypertension", 'red')
+    if k_val > 5.2: k_flag = ("Hyperkalemia", 'red')
+    if k_val < 3.4: k_flag = ("Hypokalemia", 'red')
+
+    # One row per reading: value under its heading, optional flag beside it
+    readings = (
+        (0.8, f"{aldo:.0f} ng/dL", c_aldo, None),
+        (0.5, f"{int(systolic)}/{int(diastolic)} mmHg", c_bp, bp_flag),
+        (0.2, f"{k_val:.1f} mEq/L", c_k, k_flag),
+    )
+    for y, value, color, flag in readings:
+        ax_data.text(0, y, value, fontsize=16, color=color, weight='bold')
+        if flag:
+            ax_data.text(0.5, y, flag[0], color=flag[1], fontsize=10)
+
+    return fig
+
+# --- RENDER PIPELINE ---
+# The whole pipeline (parameter lookup, physiology, drawing, SVG export) for
+# one scenario.
+def render_svg(scen):
+    _, serum_aldo, mr_efficacy, delivery, pore_block, _, _ = physiology.get_parameters(scen)
+    final_flux, systolic, k_val = physiology.STATE_TABLE[scen]
+    pore_blocked = pore_block >= 0.5 # channel plugged by a pore blocker
+    fig = draw_dashboard(final_flux, delivery, serum_aldo, mr_efficacy, systolic, k_val, pore_blocked)
+    buf = io.StringIO()
+    fig.savefig(buf, format='svg', bbox_inches='tight', metadata={'Date': None})
+    return buf.getvalue()
+
+# The scenario set is small and fixed, so every diagram is pre-rendered on
+# the first run of the server process (~1-2 s) and every later selection is
+# a dict lookup on the shared object, with no Matplotlib work at all.
+@st.cache_resource(show_spinner="Rendering scenario diagrams...")
+def svg_by_scenario():
+    return {scen: render_svg(scen) for scen in physiology.SCENARIOS}